@@ -46,6 +46,23 @@ by ``saltcheck.run_highstate_tests``.
     salt '*' saltcheck.run_highstate_tests
     salt '*' saltcheck.run_state_tests apache.deployment_validation
 
+Tests are read from the minion's copy of the master file cache. Run
+``saltcheck.update_master_cache`` after changing tests, or set ``auto_update_master_cache: True``
+in the minion config to update the cache before every test run.
+
+Rendered ``tst`` files can be cached on the minion by setting ``saltcheck_render_cache: True``
+in the minion config. The cache lives in ``cachedir/saltcheck_render`` and an entry is reused
+until the modification time or size of its ``tst`` file changes. Editing a file pulled in
+through a jinja ``include``, ``import`` or ``from`` does not invalidate the entry. Leave it
+disabled if tests use such files or render differently depending on pillar or grain data.
+
+Tests run one at a time and in order by default. Setting ``saltcheck_parallel`` to a number
+greater than 1 runs the tests of a state on that many threads, each with its own salt Caller.
+``tst`` files are always rendered one at a time.
+``saltcheck.state_apply`` and ``state.*`` tests wait for the tests before them and run alone,
+so setup and teardown steps keep their place. All other tests may run in any order, so only
+enable this when those tests do not change the minion or depend on each other.
+
 Saltcheck Keywords
 ==================
 
@@ -214,25 +231,42 @@ Supported assertions
 
 # Import Python libs
 from __future__ import absolute_import, unicode_literals, print_function
+import hashlib
 import logging
 import os
+import threading
 import time
-from json import loads, dumps
+from json import load, loads, dumps
 
 # Import Salt libs
+import salt.utils.atomicfile
 import salt.utils.files
 import salt.utils.path
 import salt.utils.yaml
+import salt.utils.yamlloader
 import salt.client
 import salt.exceptions
 from salt.utils.odict import OrderedDict
 from salt.utils.decorators import memoize
 from salt.ext import six
 
+# Import 3rd-party libs
+import yaml
+try:
+    # python 2 needs the futures backport
+    from concurrent.futures import ThreadPoolExecutor
+    HAS_FUTURES = True
+except ImportError:
+    HAS_FUTURES = False
+
 log = logging.getLogger(__name__)
 
 __virtualname__ = 'saltcheck'
 
+# renderer pipeline for tst files without a #! line, plain yaml passes jinja unchanged
+_DEFAULT_RENDERER = 'jinja|yaml'
+_JINJA_MARKERS = ('{{', '{%', '{#')
+
 
 def __virtual__():
     '''
@@ -299,7 +333,7 @@ def state_apply(state_name, **kwargs):
     # A new salt client is instantiated with the default configuration because the main module's
     # client is hardcoded to local
     # If the minion is running with a master, a non-local client is needed to lookup states
-    caller = salt.client.Caller()
+    caller = _default_caller(__opts__['conf_file'])
     if kwargs:
         grains_data = kwargs.get('grain', None)
         if grains_data:
@@ -332,16 +366,9 @@ def run_state_tests(state, saltenv=None, check_all=False):
     scheck = SaltCheck(saltenv)
     paths = scheck.get_state_search_path_list(saltenv)
     stl = StateTestLoader(search_paths=paths)
-    results = OrderedDict()
     sls_list = salt.utils.args.split_input(state)
-    for state_name in sls_list:
-        stl.add_test_files_for_sls(state_name, check_all)
-        stl.load_test_suite()
-        results_dict = OrderedDict()
-        for key, value in stl.test_dict.items():
-            result = scheck.run_test(value)
-            results_dict[key] = result
-        results[state_name] = results_dict
+    all_states = list(OrderedDict.fromkeys(sls_list))
+    results = _run_states(scheck, stl, all_states, check_all)
     return _generate_out_list(results)
 
 
@@ -364,93 +391,230 @@ def run_highstate_tests(saltenv=None, check_all=False):
     scheck = SaltCheck(saltenv)
     paths = scheck.get_state_search_path_list(saltenv)
     stl = StateTestLoader(search_paths=paths)
-    results = OrderedDict()
     sls_list = _get_top_states(saltenv)
-    all_states = []
-    for state in sls_list:
-        if state not in all_states:
-            all_states.append(state)
-
-    for state_name in all_states:
-        stl.add_test_files_for_sls(state_name, check_all)
-        stl.load_test_suite()
-        results_dict = OrderedDict()
-        for key, value in stl.test_dict.items():
-            result = scheck.run_test(value)
-            results_dict[key] = result
-        results[state_name] = results_dict
+    all_states = list(OrderedDict.fromkeys(sls_list))
+    results = _run_states(scheck, stl, all_states, check_all)
     return _generate_out_list(results)
 
 
+def _get_parallel_workers():
+    '''
+    Return the number of threads tests may run on, from the saltcheck_parallel config value
+    '''
+    try:
+        workers = max(1, int(__salt__['config.get']('saltcheck_parallel', 1)))
+    except (TypeError, ValueError):
+        log.warning("Invalid saltcheck_parallel value, running tests serially")
+        return 1
+    if workers > 1 and not HAS_FUTURES:
+        log.warning("saltcheck_parallel needs concurrent.futures, running tests serially")
+        return 1
+    return workers
+
+
+def _run_states(scheck, stl, state_names, check_all):
+    '''
+    Load and run the tests of each state, return the results per state
+    '''
+    workers = _get_parallel_workers()
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    results = OrderedDict()
+    try:
+        for state_name in state_names:
+            stl.add_test_files_for_sls(state_name, check_all)
+            stl.load_test_suite()
+            results[state_name] = _run_tests(scheck, stl.test_dict, executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return results
+
+
+def _is_barrier_test(test_dict):
+    '''
+    Determine if a test changes the minion state and must run alone, in order
+    '''
+    m_and_f = test_dict.get('module_and_function') or ''
+    return m_and_f == 'saltcheck.state_apply' or m_and_f.startswith('state.')
+
+
+def _run_tests(scheck, tests, executor=None):
+    '''
+    Run the tests of a state. Without an executor the tests run in order, with one
+    the tests between state changing tests run concurrently
+    '''
+    results = OrderedDict()
+    batch = []
+    for key, value in tests.items():
+        if _is_barrier_test(value):
+            _run_test_batch(scheck, batch, executor, results)
+            batch = []
+            results[key] = scheck.run_test(value)
+        else:
+            batch.append((key, value))
+    _run_test_batch(scheck, batch, executor, results)
+    return results
+
+
+def _run_test_batch(scheck, batch, executor, results):
+    '''
+    Run a batch of independent tests and store the results in batch order
+    '''
+    test_dicts = [value for dummy, value in batch]
+    if executor is not None and len(test_dicts) > 1:
+        returned = list(executor.map(scheck.run_test, test_dicts))
+    else:
+        returned = [scheck.run_test(value) for value in test_dicts]
+    for (key, dummy), result in zip(batch, returned):
+        results[key] = result
+
+
 def _generate_out_list(results):
     '''
     generate test results output list
     '''
-    passed = 0
-    failed = 0
-    skipped = 0
+    # statuses start with Pass, Fail or Skip
+    counters = {'Pass': 0, 'Fail': 0, 'Skip': 0}
     missing_tests = 0
     total_time = 0.0
-    for state in results:
-        if not results[state].items():
+    for state_results in results.values():
+        if not state_results:
             missing_tests = missing_tests + 1
         else:
-            for dummy, val in results[state].items():
+            for dummy, val in state_results.items():
                 log.info("dummy=%s, val=%s", dummy, val)
-                if val['status'].startswith('Pass'):
-                    passed = passed + 1
-                if val['status'].startswith('Fail'):
-                    failed = failed + 1
-                if val['status'].startswith('Skip'):
-                    skipped = skipped + 1
-                total_time = total_time + float(val['duration'])
+                status = val['status'][:4]
+                if status in counters:
+                    counters[status] += 1
+                total_time = total_time + val['duration']
     out_list = []
     for key, value in results.items():
         out_list.append({key: value})
-    out_list.sort(key=lambda x: list(x.keys())[0], reverse=False)
+    out_list.sort(key=lambda x: next(iter(x)), reverse=False)
     out_list.append({'TEST RESULTS': {'Execution Time': round(total_time, 4),
-                                      'Passed': passed, 'Failed': failed, 'Skipped': skipped,
+                                      'Passed': counters['Pass'], 'Failed': counters['Fail'],
+                                      'Skipped': counters['Skip'],
                                       'Missing Tests': missing_tests}})
     return out_list
 
 
 def _render_file(file_path):
     '''
-    call the salt utility to render a file
+    call the salt utility to render a file, returning OrderedDicts
     '''
-    # salt-call slsutil.renderer /srv/salt/jinjatest/saltcheck-tests/test1.tst
-    rendered = __salt__['slsutil.renderer'](file_path)
+    use_cache = __salt__['config.get']('saltcheck_render_cache', False)
+    if use_cache:
+        stat = os.stat(file_path)
+        cache_key = [stat.st_mtime, stat.st_size]
+        cache_file = os.path.join(__opts__['cachedir'], 'saltcheck_render',
+                                  hashlib.sha1(file_path.encode('utf-8')).hexdigest() + '.json')
+        if os.path.isfile(cache_file):
+            try:
+                with salt.utils.files.fopen(cache_file, 'r') as cached:
+                    entry = load(cached, object_pairs_hook=OrderedDict)
+                if isinstance(entry, dict) and 'data' in entry and entry.get('key') == cache_key:
+                    log.info("using cached render for: %s", file_path)
+                    return entry['data']
+            except (IOError, OSError, ValueError):
+                log.debug("unable to read render cache: %s", cache_file)
+    with salt.utils.files.fopen(file_path, 'r') as test_file:
+        content = test_file.read()
+    if _is_plain_yaml(content):
+        # nothing for jinja to do, parse the yaml directly
+        try:
+            rendered = salt.utils.yaml.safe_load(content, Loader=_ordered_yaml_loader) or {}
+        except yaml.YAMLError as exc:
+            raise salt.exceptions.SaltRenderError(
+                'Unable to render {0}: {1}'.format(file_path, exc))
+    else:
+        # salt-call slsutil.renderer /srv/salt/jinjatest/saltcheck-tests/test1.tst
+        rendered = __salt__['slsutil.renderer'](file_path, default_renderer=_DEFAULT_RENDERER)
     log.info("rendered: %s", rendered)
+    if not isinstance(rendered, OrderedDict):
+        rendered = _to_odict(rendered)
+    if use_cache:
+        try:
+            serialized = dumps({'key': cache_key, 'data': rendered})
+        except (TypeError, ValueError):
+            # e.g. yaml dates, the file is rendered again on every run
+            log.debug("rendered tests are not JSON serializable, not caching: %s", file_path)
+            serialized = None
+        else:
+            # a cache hit must return exactly what rendering does, json turns non-string keys
+            # into strings for example
+            if loads(serialized, object_pairs_hook=OrderedDict)['data'] != rendered:
+                log.debug("rendered tests change in JSON, not caching: %s", file_path)
+                serialized = None
+        if serialized is not None:
+            try:
+                cache_dir = os.path.dirname(cache_file)
+                if not os.path.isdir(cache_dir):
+                    os.makedirs(cache_dir)
+                with salt.utils.atomicfile.atomic_open(cache_file, 'w') as cached:
+                    cached.write(serialized)
+            except (IOError, OSError):
+                log.debug("unable to write render cache: %s", cache_file)
     return rendered
 
 
-@memoize
-def _is_valid_module(module):
+def _is_plain_yaml(content):
     '''
-    Return a list of all modules available on minion
+    Determine if file content can skip the salt render pipeline: no renderer is
+    chosen in the file, so _DEFAULT_RENDERER applies, and no jinja markup is present
     '''
-    modules = __salt__['sys.list_modules']()
-    return bool(module in modules)
+    if content.lstrip().startswith('#!'):
+        return False
+    return not any(marker in content for marker in _JINJA_MARKERS)
 
 
-def _get_auto_update_cache_value():
+def _ordered_yaml_loader(*args):
     '''
-    Return the config value of auto_update_master_cache
+    Return the salt yaml loader building OrderedDicts, as the yaml renderer does
     '''
-    __salt__['config.get']('auto_update_master_cache')
-    return True
+    return salt.utils.yamlloader.SaltYamlSafeLoader(*args, dictclass=OrderedDict)
+
+
+def _to_odict(data):
+    '''
+    Recursively convert the dicts in rendered data to OrderedDicts
+    '''
+    if isinstance(data, dict):
+        return OrderedDict((key, _to_odict(value)) for key, value in data.items())
+    if isinstance(data, list):
+        return [_to_odict(value) for value in data]
+    return data
+
+
+def _new_local_caller(conf_file):
+    '''
+    Build a salt Caller using the local file client
+    '''
+    local_opts = salt.config.minion_config(conf_file)
+    local_opts['file_client'] = 'local'
+    return salt.client.Caller(mopts=local_opts)
 
 
 @memoize
-def _is_valid_function(module_name, function):
+def _local_caller(conf_file):
     '''
-    Determine if a function is valid for a module
+    Return a salt Caller using the local file client, built once per config file
     '''
-    try:
-        functions = __salt__['sys.list_functions'](module_name)
-    except salt.exceptions.SaltException:
-        functions = ["unable to look up functions"]
-    return "{0}.{1}".format(module_name, function) in functions
+    return _new_local_caller(conf_file)
+
+
+@memoize
+def _default_caller(conf_file):
+    '''
+    Return a salt Caller with the default configuration, built once per config file
+    '''
+    return salt.client.Caller(c_path=conf_file)
+
+
+def _get_auto_update_cache_value():
+    '''
+    Return the config value of auto_update_master_cache
+    '''
+    return __salt__['config.get']('auto_update_master_cache', False)
 
 
 def _get_top_states(saltenv='base'):
@@ -468,6 +632,194 @@ def _get_top_states(saltenv='base'):
     return alt_states
 
 
+def _assert_equal(expected, returned, assert_print_result=True):
+    '''
+    Test if two objects are equal
+    '''
+    result = "Pass"
+
+    try:
+        if assert_print_result:
+            assert (expected == returned), "{0} is not equal to {1}".format(expected, returned)
+        else:
+            assert (expected == returned), "Result is not equal"
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_not_equal(expected, returned, assert_print_result=True):
+    '''
+    Test if two objects are not equal
+    '''
+    result = "Pass"
+    try:
+        if assert_print_result:
+            assert (expected != returned), "{0} is equal to {1}".format(expected, returned)
+        else:
+            assert (expected != returned), "Result is equal"
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_true(returned):
+    '''
+    Test if an boolean is True
+    '''
+    result = "Pass"
+    try:
+        assert (returned is True), "{0} not True".format(returned)
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_false(returned):
+    '''
+    Test if an boolean is False
+    '''
+    result = "Pass"
+    if isinstance(returned, str):
+        try:
+            returned = bool(returned)
+        except ValueError:
+            raise
+    try:
+        assert (returned is False), "{0} not False".format(returned)
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_in(expected, returned, assert_print_result=True):
+    '''
+    Test if a value is in the list of returned values
+    '''
+    result = "Pass"
+    try:
+        if assert_print_result:
+            assert (expected in returned), "{0} not found in {1}".format(expected, returned)
+        else:
+            assert (expected in returned), "Result not found"
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_not_in(expected, returned, assert_print_result=True):
+    '''
+    Test if a value is not in the list of returned values
+    '''
+    result = "Pass"
+    try:
+        if assert_print_result:
+            assert (expected not in returned), "{0} was found in {1}".format(expected, returned)
+        else:
+            assert (expected not in returned), "Result was found"
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_greater(expected, returned):
+    '''
+    Test if a value is greater than the returned value
+    '''
+    result = "Pass"
+    try:
+        assert (expected > returned), "{0} not False".format(returned)
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_greater_equal(expected, returned):
+    '''
+    Test if a value is greater than or equal to the returned value
+    '''
+    result = "Pass"
+    try:
+        assert (expected >= returned), "{0} not False".format(returned)
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_less(expected, returned):
+    '''
+    Test if a value is less than the returned value
+    '''
+    result = "Pass"
+    try:
+        assert (expected < returned), "{0} not False".format(returned)
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_less_equal(expected, returned):
+    '''
+    Test if a value is less than or equal to the returned value
+    '''
+    result = "Pass"
+    try:
+        assert (expected <= returned), "{0} not False".format(returned)
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_empty(returned):
+    '''
+    Test if a returned value is empty
+    '''
+    result = "Pass"
+    try:
+        assert (not returned), "{0} is not empty".format(returned)
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+def _assert_not_empty(returned):
+    '''
+    Test if a returned value is not empty
+    '''
+    result = "Pass"
+    try:
+        assert (returned), "value is empty"
+    except AssertionError as err:
+        result = "Fail: " + six.text_type(err)
+    return result
+
+
+# assertion name -> (function, takes expected-return, takes print_result)
+_ASSERTIONS = {
+    "assertEqual": (_assert_equal, True, True),
+    "assertNotEqual": (_assert_not_equal, True, True),
+    "assertTrue": (_assert_true, False, False),
+    "assertFalse": (_assert_false, False, False),
+    "assertIn": (_assert_in, True, True),
+    "assertNotIn": (_assert_not_in, True, True),
+    "assertGreater": (_assert_greater, True, False),
+    "assertGreaterEqual": (_assert_greater_equal, True, False),
+    "assertLess": (_assert_less, True, False),
+    "assertLessEqual": (_assert_less_equal, True, False),
+    "assertEmpty": (_assert_empty, False, False),
+    "assertNotEmpty": (_assert_not_empty, False, False),
+}
+
+_ASSERTIONS_ALL = frozenset(_ASSERTIONS)
+
+# assertions that do not require an expected-return
+_ASSERTIONS_NO_EXPECTED = frozenset({"assertEmpty", "assertNotEmpty", "assertTrue", "assertFalse"})
+
+# assertions where the expected-return is not cast to the returned type
+_CAST_SKIP = frozenset({"assertIn", "assertNotIn", "assertEmpty", "assertNotEmpty",
+                        "assertTrue", "assertFalse"})
+
+
 class SaltCheck(object):
     '''
     This class validates and runs the saltchecks
@@ -479,17 +831,14 @@ class SaltCheck(object):
         self.results_dict = {}
         self.results_dict_summary = {}
         self.saltenv = saltenv
-        self.assertions_list = '''assertEqual assertNotEqual
-                                  assertTrue assertFalse
-                                  assertIn assertNotIn
-                                  assertGreater
-                                  assertGreaterEqual
-                                  assertLess assertLessEqual
-                                  assertEmpty assertNotEmpty'''.split()
-        self.auto_update_master_cache = _get_auto_update_cache_value
-        local_opts = salt.config.minion_config(__opts__['conf_file'])
-        local_opts['file_client'] = 'local'
-        self.salt_lc = salt.client.Caller(mopts=local_opts)
+        self.auto_update_master_cache = _get_auto_update_cache_value()
+        self.salt_lc = _local_caller(__opts__['conf_file'])
+        # worker threads build their own Caller so they never share its loader and __context__
+        self._caller_thread = threading.current_thread()
+        self._thread_callers = threading.local()
+        # modules and functions are both looked up in the local Caller's loader, which runs the tests
+        self._modules_set = frozenset(self.salt_lc.cmd('sys.list_modules'))
+        self._fn_cache = {}  # module name -> frozenset of its functions
         if self.auto_update_master_cache:
             update_master_cache(saltenv)
 
@@ -506,33 +855,31 @@ class SaltCheck(object):
         4 points needed for test with assertion not requiring expected return
         '''
         tots = 0  # need total of >= 6 to be a valid test
-        skip = test_dict.get('skip', False)
         m_and_f = test_dict.get('module_and_function', None)
         assertion = test_dict.get('assertion', None)
         exp_ret_key = 'expected-return' in test_dict.keys()
         exp_ret_val = test_dict.get('expected-return', None)
         log.info("__is_valid_test has test: %s", test_dict)
-        if skip:
-            required_total = 0
-        elif m_and_f in ["saltcheck.state_apply"]:
+        if m_and_f == "saltcheck.state_apply":
             required_total = 2
-        elif assertion in ["assertEmpty",
-                           "assertNotEmpty",
-                           "assertTrue",
-                           "assertFalse"]:
+        elif assertion in _ASSERTIONS_NO_EXPECTED:
             required_total = 4
         else:
             required_total = 6
 
         if m_and_f:
             tots += 1
-            module, function = m_and_f.split('.')
-            if _is_valid_module(module):
+            module, dummy, function = m_and_f.rpartition('.')
+            if not module or not function:
+                # no points would still leave enough for some assertions, reject outright
+                log.info("__is_valid_test has invalid m_and_f: %s", m_and_f)
+                return False
+            if module in self._modules_set:
                 tots += 1
-            if _is_valid_function(module, function):
+            if self._is_valid_function(module, function):
                 tots += 1
             log.info("__is_valid_test has valid m_and_f")
-        if assertion in self.assertions_list:
+        if assertion in _ASSERTIONS_ALL:
             log.info("__is_valid_test has valid_assertion")
             tots += 1
 
@@ -546,6 +893,31 @@ class SaltCheck(object):
         log.info("__test score: %s and required: %s", tots, required_total)
         return tots >= required_total
 
+    def _get_caller(self):
+        '''
+        Return the salt Caller for the current thread
+        '''
+        if threading.current_thread() is self._caller_thread:
+            return self.salt_lc
+        caller = getattr(self._thread_callers, 'caller', None)
+        if caller is None:
+            caller = _new_local_caller(__opts__['conf_file'])
+            self._thread_callers.caller = caller
+        return caller
+
+    def _is_valid_function(self, module_name, function):
+        '''
+        Determine if a function is valid for a module
+        '''
+        functions = self._fn_cache.get(module_name)
+        if functions is None:
+            try:
+                functions = frozenset(self._get_caller().cmd('sys.list_functions', module_name))
+            except salt.exceptions.SaltException:
+                functions = frozenset()
+            self._fn_cache[module_name] = functions
+        return "{0}.{1}".format(module_name, function) in functions
+
     def _call_salt_command(self,
                            fun,
                            args,
@@ -554,20 +926,7 @@ class SaltCheck(object):
         '''
         Generic call of salt Caller command
         '''
-        value = False
-        try:
-            if args and kwargs:
-                value = self.salt_lc.cmd(fun, *args, **kwargs)
-            elif args and not kwargs:
-                value = self.salt_lc.cmd(fun, *args)
-            elif not args and kwargs:
-                value = self.salt_lc.cmd(fun, **kwargs)
-            else:
-                value = self.salt_lc.cmd(fun)
-        except salt.exceptions.SaltException:
-            raise
-        except Exception:
-            raise
+        value = self._get_caller().cmd(fun, *(args or ()), **(kwargs or {}))
         if isinstance(value, dict) and assertion_section:
             return str(value.get(assertion_section, False))
         else:
@@ -577,70 +936,41 @@ class SaltCheck(object):
         '''
         Run a single saltcheck test
         '''
+        # skipped tests are not validated, avoiding the module and function lookups
+        if test_dict.get('skip', False):
+            return {'status': 'Skip', 'duration': 0.0}
         start = time.time()
         if self.__is_valid_test(test_dict):
-            skip = test_dict.get('skip', False)
-            if skip:
-                return {'status': 'Skip', 'duration': 0.0}
             mod_and_func = test_dict['module_and_function']
             assertion_section = test_dict.get('assertion_section', None)
             args = test_dict.get('args', None)
-            kwargs = test_dict.get('kwargs', {})
-            if not kwargs:
-                kwargs = {}
-
-            pillar_data = test_dict.get('pillar-data', {})
+            # copy so the loaded test is never modified between runs
+            kwargs = dict(test_dict.get('kwargs') or ())
+            pillar_data = test_dict.get('pillar-data')
             if pillar_data:
-                kwargs.update({'pillar': pillar_data})
-            else:
-                # make sure we clean pillar from previous test
-                if 'pillar' in kwargs:
-                    kwargs.pop('pillar')
-
-            grain_data = test_dict.get('grain-data', {})
+                kwargs['pillar'] = pillar_data
+            grain_data = test_dict.get('grain-data')
             if grain_data:
-                kwargs.update({'grain': grain_data})
-            else:
-                # make sure we clean grain from previous test
-                if 'grain' in kwargs:
-                    kwargs.pop('grain')
+                kwargs['grain'] = grain_data
 
-            if mod_and_func in ["saltcheck.state_apply"]:
+            if mod_and_func == "saltcheck.state_apply":
                 assertion = "assertNotEmpty"
             else:
                 assertion = test_dict['assertion']
             expected_return = test_dict.get('expected-return', None)
             assert_print_result = test_dict.get('print_result', True)
             actual_return = self._call_salt_command(mod_and_func, args, kwargs, assertion_section)
-            if assertion not in ["assertIn", "assertNotIn", "assertEmpty", "assertNotEmpty",
-                                 "assertTrue", "assertFalse"]:
+            if assertion not in _CAST_SKIP:
                 expected_return = self._cast_expected_to_returned_type(expected_return, actual_return)
-            if assertion == "assertEqual":
-                value = self.__assert_equal(expected_return, actual_return, assert_print_result)
-            elif assertion == "assertNotEqual":
-                value = self.__assert_not_equal(expected_return, actual_return, assert_print_result)
-            elif assertion == "assertTrue":
-                value = self.__assert_true(actual_return)
-            elif assertion == "assertFalse":
-                value = self.__assert_false(actual_return)
-            elif assertion == "assertIn":
-                value = self.__assert_in(expected_return, actual_return, assert_print_result)
-            elif assertion == "assertNotIn":
-                value = self.__assert_not_in(expected_return, actual_return, assert_print_result)
-            elif assertion == "assertGreater":
-                value = self.__assert_greater(expected_return, actual_return)
-            elif assertion == "assertGreaterEqual":
-                value = self.__assert_greater_equal(expected_return, actual_return)
-            elif assertion == "assertLess":
-                value = self.__assert_less(expected_return, actual_return)
-            elif assertion == "assertLessEqual":
-                value = self.__assert_less_equal(expected_return, actual_return)
-            elif assertion == "assertEmpty":
-                value = self.__assert_empty(actual_return)
-            elif assertion == "assertNotEmpty":
-                value = self.__assert_not_empty(actual_return)
-            else:
+            fun, needs_expected, needs_print = _ASSERTIONS.get(assertion, (None, False, False))
+            if fun is None:
                 value = "Fail - bad assertion"
+            elif needs_expected and needs_print:
+                value = fun(expected_return, actual_return, assert_print_result)
+            elif needs_expected:
+                value = fun(expected_return, actual_return)
+            else:
+                value = fun(actual_return)
         else:
             value = "Fail - invalid test"
         end = time.time()
@@ -656,9 +986,13 @@ class SaltCheck(object):
         Cast the expected to the type of variable returned
         '''
         ret_type = type(returned)
+        if type(expected) is ret_type:
+            return expected
+        # bool() of any non-empty string is True, so map the names explicitly
+        if ret_type is bool and isinstance(expected, six.string_types) \
+                and expected.lower() in ('true', 'false'):
+            return expected.lower() == 'true'
         new_expected = expected
-        if expected == "False" and ret_type == bool:
-            expected = False
         try:
             new_expected = ret_type(expected)
         except ValueError:
@@ -670,179 +1004,14 @@ class SaltCheck(object):
         return new_expected
 
     @staticmethod
-    def __assert_equal(expected, returned, assert_print_result=True):
-        '''
-        Test if two objects are equal
-        '''
-        result = "Pass"
-
-        try:
-            if assert_print_result:
-                assert (expected == returned), "{0} is not equal to {1}".format(expected, returned)
-            else:
-                assert (expected == returned), "Result is not equal"
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_not_equal(expected, returned, assert_print_result=True):
-        '''
-        Test if two objects are not equal
-        '''
-        result = "Pass"
-        try:
-            if assert_print_result:
-                assert (expected != returned), "{0} is equal to {1}".format(expected, returned)
-            else:
-                assert (expected != returned), "Result is equal"
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_true(returned):
-        '''
-        Test if an boolean is True
-        '''
-        result = "Pass"
-        try:
-            assert (returned is True), "{0} not True".format(returned)
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_false(returned):
-        '''
-        Test if an boolean is False
-        '''
-        result = "Pass"
-        if isinstance(returned, str):
-            try:
-                returned = bool(returned)
-            except ValueError:
-                raise
-        try:
-            assert (returned is False), "{0} not False".format(returned)
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_in(expected, returned, assert_print_result=True):
-        '''
-        Test if a value is in the list of returned values
-        '''
-        result = "Pass"
-        try:
-            if assert_print_result:
-                assert (expected in returned), "{0} not found in {1}".format(expected, returned)
-            else:
-                assert (expected in returned), "Result not found"
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_not_in(expected, returned, assert_print_result=True):
-        '''
-        Test if a value is not in the list of returned values
-        '''
-        result = "Pass"
-        try:
-            if assert_print_result:
-                assert (expected not in returned), "{0} was found in {1}".format(expected, returned)
-            else:
-                assert (expected not in returned), "Result was found"
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_greater(expected, returned):
-        '''
-        Test if a value is greater than the returned value
-        '''
-        result = "Pass"
-        try:
-            assert (expected > returned), "{0} not False".format(returned)
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_greater_equal(expected, returned):
-        '''
-        Test if a value is greater than or equal to the returned value
-        '''
-        result = "Pass"
-        try:
-            assert (expected >= returned), "{0} not False".format(returned)
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_less(expected, returned):
-        '''
-        Test if a value is less than the returned value
-        '''
-        result = "Pass"
-        try:
-            assert (expected < returned), "{0} not False".format(returned)
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_less_equal(expected, returned):
-        '''
-        Test if a value is less than or equal to the returned value
-        '''
-        result = "Pass"
-        try:
-            assert (expected <= returned), "{0} not False".format(returned)
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_empty(returned):
-        '''
-        Test if a returned value is empty
-        '''
-        result = "Pass"
-        try:
-            assert (not returned), "{0} is not empty".format(returned)
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
-    def __assert_not_empty(returned):
-        '''
-        Test if a returned value is not empty
-        '''
-        result = "Pass"
-        try:
-            assert (returned), "value is empty"
-        except AssertionError as err:
-            result = "Fail: " + six.text_type(err)
-        return result
-
-    @staticmethod
+    @memoize
     def get_state_search_path_list(saltenv='base'):
         '''
         For the state file system, return a list of paths to search for states
         '''
         # state cache should be updated before running this method
-        search_list = []
-        cachedir = __opts__.get('cachedir', None)
         log.info("Searching for files in saltenv: %s", saltenv)
-        path = cachedir + os.sep + "files" + os.sep + saltenv
-        search_list.append(path)
-        return search_list
+        return [os.path.join(__opts__['cachedir'], 'files', saltenv)]
 
 
 class StateTestLoader(object):
@@ -856,6 +1025,7 @@ class StateTestLoader(object):
         self.path_type = None
         self.test_files = []  # list of file paths
         self.test_dict = OrderedDict()
+        self._render_cache = {}  # file path -> rendered tests, for this run
 
     def load_test_suite(self):
         '''
@@ -871,27 +1041,58 @@ class StateTestLoader(object):
         loads in one test file
         '''
         # use the salt renderer module to interpret jinja and etc
-        tests = _render_file(filepath)
-        # use json as a convenient way to convert the OrderedDicts from salt renderer
-        mydict = loads(dumps(tests), object_pairs_hook=OrderedDict)
-        for key, value in mydict.items():
-            self.test_dict[key] = value
+        mydict = self._render_file(filepath)
+        self.test_dict.update(mydict)
         return
 
+    def _render_file(self, filepath):
+        '''
+        Render a test file once per loader, tests shared by several states are reused
+        '''
+        rendered = self._render_cache.get(filepath)
+        if rendered is None:
+            rendered = _render_file(filepath)
+            self._render_cache[filepath] = rendered
+        return rendered
+
     def _gather_files(self, filepath):
         '''
         Gather files for a test suite
         '''
         self.test_files = []
         filepath = filepath + os.sep + 'saltcheck-tests'
-        for dirname, dummy, filelist in salt.utils.path.os_walk(filepath):
-            filelist.sort()
-            for fname in filelist:
-                if fname.endswith('.tst'):
-                    start_path = dirname + os.sep + fname
-                    full_path = os.path.abspath(start_path)
-                    log.info("Found test: %s", full_path)
-                    self.test_files.append(full_path)
+        # paths are built from the absolute base, so they need no abspath of their own
+        base = os.path.abspath(filepath)
+        # top-down like os.walk: the sorted tests of a directory come before its subdirectories
+        scandir = getattr(os, 'scandir', None)
+        if scandir is None:
+            # python 2 has no os.scandir
+            for dirname, dirlist, filelist in salt.utils.path.os_walk(base):
+                dirlist.sort()
+                filelist.sort()
+                for fname in filelist:
+                    if fname.endswith('.tst'):
+                        full_path = os.path.join(dirname, fname)
+                        log.info("Found test: %s", full_path)
+                        self.test_files.append(full_path)
+        else:
+            stack = [base]
+            while stack:
+                dirname = stack.pop()
+                try:
+                    # reading every entry closes the iterator, also before python 3.6
+                    entries = sorted(scandir(dirname), key=lambda entry: entry.name)
+                except OSError:
+                    continue
+                subdirs = []
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith('.tst') and entry.is_file():
+                        log.info("Found test: %s", entry.path)
+                        self.test_files.append(entry.path)
+                # reversed, so the first subdirectory is popped next
+                stack.extend(reversed(subdirs))
         return
 
     @staticmethod
@@ -104,3 +104,10 @@ ae-12:
   assertion: assertEqual
   expected-return: False
 
+ae-13:
+  module_and_function: saltcheck_returns.get_bool
+  args:
+    - False
+  kwargs:
+  assertion: assertEqual
+  expected-return: "False"